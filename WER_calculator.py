@@ -1,23 +1,15 @@
-import pandas as pd
+from wer_aggregate import aggregate_wer
 
 def get_wer_from_csv(csv_file):
     try:
-        df = pd.read_csv(csv_file)
-        valid_wers = []
+        # Reads only the 'wer' column, in chunks; invalid values like "ERROR" are skipped
+        stats, _ = aggregate_wer(csv_file, weighted=False)
 
-        for wer_value in df['wer']:
-            try:
-                wer_float = float(str(wer_value).strip('%'))
-                valid_wers.append(wer_float)
-            except (ValueError, AttributeError):
-                pass  # skip invalid values like "ERROR"
-
-        if not valid_wers:
+        if not stats["count"]:
             print(f"❌ No valid WER values found in '{csv_file}'.")
             return
 
-        average_wer = sum(valid_wers) / len(valid_wers)
-        print(f"\n✅ Overall Whisper WER: {average_wer:.2f}%\n")
+        print(f"\n✅ Overall Whisper WER: {stats['mean_wer'] * 100:.2f}%\n")
 
     except FileNotFoundError:
         print(f"❌ File not found: {csv_file}")
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Attach Pyannote speaker turns to word timings saved by realtime_vosk.py,
+without running ASR a second time.
+
+Usage:
+  python align_speakers.py --words transcripts/transcript_20250101_120000.jsonl \
+                           --audio transcripts/transcript_20250101_120000.wav
+  python align_speakers.py --words meeting.jsonl --rttm meeting.rttm
+"""
+
+import os
+import json
+import argparse
+import numpy as np
+
+# Words per block when comparing words x turns, to bound the temporary matrices.
+WORD_BLOCK = 4096
+
+def load_words(words_path):
+    """Flatten a word-timed JSONL log into a list of word dicts."""
+    words = []
+    with open(words_path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                words.extend(json.loads(line).get("result", []))
+    return words
+
+def load_turns(rttm_path):
+    """(speaker, start, end) turns from an RTTM file."""
+    turns = []
+    with open(rttm_path, "r", encoding="utf-8") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 8 and parts[0] == "SPEAKER":
+                start, duration = float(parts[3]), float(parts[4])
+                turns.append((parts[7], start, start + duration))
+    return turns
+
+def assign_speakers(words, turns):
+    """
+    Label each word with a speaker turn containing its midpoint. Turns may overlap:
+    among covering turns the one overlapping the word most wins, ties going to the
+    shortest turn (e.g. a backchannel inside a long turn). Words in a gap between
+    turns take the turn with the nearest edge.
+    """
+    if not words or not turns:
+        return words
+    labels = [t[0] for t in turns]
+    starts = np.array([t[1] for t in turns])
+    ends = np.array([t[2] for t in turns])
+    lengths = ends - starts
+    word_starts = np.array([w["start"] for w in words])
+    word_ends = np.array([w["end"] for w in words])
+
+    idx = np.empty(len(words), dtype=np.int64)
+    for b in range(0, len(words), WORD_BLOCK):
+        ws = word_starts[b:b + WORD_BLOCK, None]
+        we = word_ends[b:b + WORD_BLOCK, None]
+        mids = (ws + we) / 2
+        covers = (starts <= mids) & (mids < ends)
+
+        overlap = np.where(covers, np.minimum(we, ends) - np.maximum(ws, starts), -np.inf)
+        best = overlap.max(axis=1, keepdims=True)
+        candidates = covers & (overlap >= best - 1e-6)
+        chosen = np.where(candidates, lengths, np.inf).argmin(axis=1)
+
+        distance = np.maximum(np.maximum(starts - mids, mids - ends), 0)
+        nearest = distance.argmin(axis=1)
+        idx[b:b + WORD_BLOCK] = np.where(covers.any(axis=1), chosen, nearest)
+
+    for w, i in zip(words, idx):
+        w["speaker"] = labels[i]
+    return words
+
+def write_outputs(words, words_path):
+    """Write <stem>.speakers.jsonl (one result per speaker turn) and <stem>.diarized.txt."""
+    stem = os.path.splitext(words_path)[0]
+    jsonl_path = stem + ".speakers.jsonl"
+    text_path = stem + ".diarized.txt"
+
+    segments = []
+    for w in words:
+        if segments and segments[-1]["speaker"] == w.get("speaker"):
+            segments[-1]["result"].append(w)
+        else:
+            segments.append({"speaker": w.get("speaker"), "result": [w]})
+
+    with open(jsonl_path, "w", encoding="utf-8") as f:
+        for seg in segments:
+            seg["text"] = " ".join(w["word"] for w in seg["result"])
+            f.write(json.dumps(seg) + "\n")
+    with open(text_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(f"[{seg['speaker']}]: {seg['text']}" for seg in segments))
+    return jsonl_path, text_path
+
+def main():
+    parser = argparse.ArgumentParser(description="Attach speaker labels to saved realtime word timings")
+    parser.add_argument("--words", required=True, help="Word-timed JSONL written by realtime_vosk.py")
+    parser.add_argument("--audio", help="Audio saved with realtime_vosk.py --save-audio (diarized with the cache)")
+    parser.add_argument("--rttm", help="Existing RTTM file to use instead of diarizing --audio")
+    args = parser.parse_args()
+
+    if not os.path.isfile(args.words):
+        print(f"❌ Word timings file not found: {args.words}")
+        return
+    if not (args.audio or args.rttm):
+        print("❌ Provide --audio or --rttm.")
+        return
+
+    if args.rttm:
+        if not os.path.isfile(args.rttm):
+            print(f"❌ RTTM file not found: {args.rttm}")
+            return
+        turns = load_turns(args.rttm)
+    else:
+        if not os.path.isfile(args.audio):
+            print(f"❌ Audio file not found: {args.audio}")
+            return
+        from diarize_whisper import diarize
+        try:
+            diarization, _, _ = diarize(args.audio)
+        except RuntimeError as e:
+            print(f"❌ {e}")
+            return
+        turns = [(speaker, turn.start, turn.end)
+                 for turn, _, speaker in diarization.itertracks(yield_label=True)]
+
+    words = load_words(args.words)
+    if not words:
+        print("⚠️ No word timings found. Was the transcript recorded with SetWords(True)?")
+        return
+
+    assign_speakers(words, turns)
+    jsonl_path, text_path = write_outputs(words, args.words)
+    print(f"✅ {len(words)} words labelled across {len({w['speaker'] for w in words})} speaker(s)")
+    print(f"💾 Speaker-attributed words saved to {jsonl_path}")
+    print(f"💾 Diarized transcript saved to {text_path}")
+
+if __name__ == "__main__":
+    main()
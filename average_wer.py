@@ -3,18 +3,13 @@
 Calculate the average WER from a CSV file containing a 'wer' column.
 """
 
-import pandas as pd
+from wer_aggregate import aggregate_wer
 
 def calculate_average_wer(csv_file):
-    df = pd.read_csv(csv_file)
+    # Streams only the 'wer' column; accepts "2.35%" strings as well as fractions
+    stats, _ = aggregate_wer(csv_file, weighted=False)
 
-    # Convert 'wer' column from string like "2.35%" to float
-    df['wer_float'] = df['wer'].str.strip('%').astype(float) / 100
-
-    # Compute the average
-    average_wer = df['wer_float'].mean()
-
-    print(f"\n✅ Average WER: {average_wer * 100:.2f}%")
+    print(f"\n✅ Average WER: {stats['mean_wer'] * 100:.2f}%")
 
 if __name__ == "__main__":
     calculate_average_wer("evaluation_results.csv")
@@ -10,19 +10,12 @@ import argparse
 import os
 import wave
 import json
-import string
 import csv
 from vosk import Model, KaldiRecognizer
 from jiwer import wer
+from text_normalizer import normalize_text
 
 # ---------- Helpers ----------
-def normalize_text(text: str) -> str:
-    """Lowercase, strip punctuation, and trim extra spaces."""
-    text = text.lower()
-    text = text.translate(str.maketrans("", "", string.punctuation))
-    text = " ".join(text.split())
-    return text
-
 def transcribe_wav(model, wav_path):
     """Transcribe a single WAV file using Vosk."""
     try:
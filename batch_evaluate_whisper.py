@@ -8,6 +8,8 @@ import argparse
 import whisper
 import jiwer
 import os
+import numpy as np
+from text_normalizer import normalize_batch, normalized_references
 
 def main():
     parser = argparse.ArgumentParser(description="Batch evaluate a Whisper model on a dataset CSV")
@@ -20,7 +22,9 @@ def main():
 
     df = pd.read_csv(args.input_csv)
     df['audio_path'] = df['audio_path'].str.replace('.flac', '.wav', regex=False)
-    df['hypothesis'] = ''
+    df['hypothesis'] = None
+    # Failures are recorded here, never as hypothesis text, so they aren't scored.
+    df['status'] = 'ok'
 
     print("🚀 Starting batch transcription...")
     for index, row in df.iterrows():
@@ -28,7 +32,7 @@ def main():
         try:
             if not os.path.isfile(row['audio_path']):
                 print(f"❌ WAV file not found, skipping: {row['audio_path']}")
-                df.at[index, 'hypothesis'] = "FILE_NOT_FOUND_ERROR"
+                df.at[index, 'status'] = "FILE_NOT_FOUND_ERROR"
                 continue
 
             result = model.transcribe(row['audio_path'], language='en')
@@ -36,16 +40,21 @@ def main():
 
         except Exception as e:
             print(f"❌ Error during transcription: {e}, skipping.")
-            df.at[index, 'hypothesis'] = "TRANSCRIPTION_ERROR"
+            df.at[index, 'status'] = "TRANSCRIPTION_ERROR"
 
-    # Compute WER for each row
-    df['wer'] = df.apply(lambda row: jiwer.wer(row['normalized_gt'], row['hypothesis']), axis=1)
+    # Score normalized hypotheses against normalized references (same rules for both)
+    df['normalized_gt'] = normalized_references(df)
+    df['normalized_hypothesis'] = normalize_batch(df['hypothesis'])
+    df['wer'] = [jiwer.wer(gt, hyp) if status == 'ok' else np.nan
+                 for gt, hyp, status in zip(df['normalized_gt'], df['normalized_hypothesis'], df['status'])]
 
     output_file = "whisper_evaluation_results.csv"
     df.to_csv(output_file, index=False)
 
     overall_wer = df['wer'].mean()
-    print(f"\n✅ Batch evaluation complete. Overall WER: {overall_wer * 100:.2f}%")
+    failed = (df['status'] != 'ok').sum()
+    print(f"\n✅ Batch evaluation complete. Overall WER: {overall_wer * 100:.2f}%"
+          f"{f' ({failed} failed row(s) excluded)' if failed else ''}")
     print(f"📄 Detailed results saved to {output_file}")
 
 if __name__ == "__main__":
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Compare several ASR engines/models on the same dataset in one pass.
+
+Each utterance is decoded once (via ffmpeg) into a shared 16kHz mono PCM buffer and
+handed concurrently to every configured engine, each running in its own worker pool.
+All hypotheses are scored with the same normalizer and written to one joined CSV.
+
+Usage:
+  python compare_engines.py --input_csv dataset.csv \
+      --engine vosk:models/vosk-model-en-us-0.22 --engine whisper:base.en --engine whisper:small.en
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+import jiwer
+from text_normalizer import normalize_batch, normalized_references
+
+SAMPLE_RATE = 16000
+MAX_IN_FLIGHT = 32
+
+# ---------- Helpers ----------
+def decode_audio(audio_path):
+    """Decode any ffmpeg-readable file to 16kHz mono int16 PCM bytes."""
+    result = subprocess.run([
+        'ffmpeg', '-nostdin', '-loglevel', 'error', '-i', audio_path,
+        '-f', 's16le', '-ac', '1', '-ar', str(SAMPLE_RATE), '-'
+    ], capture_output=True, check=True)
+    return result.stdout
+
+class Utterance:
+    """Decoded audio shared by all engines; float32 view is built lazily, once."""
+
+    def __init__(self, pcm):
+        self.pcm = pcm
+        self._float = None
+        self._lock = threading.Lock()
+
+    @property
+    def float32(self):
+        with self._lock:
+            if self._float is None:
+                self._float = np.frombuffer(self.pcm, dtype=np.int16).astype(np.float32) / 32768.0
+        return self._float
+
+# ---------- Engines ----------
+class VoskEngine:
+    def __init__(self, model_path, workers):
+        from vosk import Model
+        self.name = f"vosk:{os.path.basename(os.path.normpath(model_path))}"
+        self.model = Model(model_path)
+        self.pool = ThreadPoolExecutor(max_workers=workers)
+
+    def transcribe(self, utt):
+        from vosk import KaldiRecognizer
+        rec = KaldiRecognizer(self.model, SAMPLE_RATE)
+        results = []
+        for offset in range(0, len(utt.pcm), 8000):
+            if rec.AcceptWaveform(utt.pcm[offset:offset + 8000]):
+                results.append(json.loads(rec.Result()).get("text", ""))
+        results.append(json.loads(rec.FinalResult()).get("text", ""))
+        return " ".join(results).strip()
+
+class WhisperEngine:
+    def __init__(self, model_size, workers):
+        import whisper
+        self.name = f"whisper:{model_size}"
+        # A Whisper model is not safe to share across threads; one model per worker.
+        self.models = [whisper.load_model(model_size) for _ in range(workers)]
+        self._free = list(range(workers))
+        self._lock = threading.Lock()
+        self.pool = ThreadPoolExecutor(max_workers=workers)
+
+    def transcribe(self, utt):
+        with self._lock:
+            slot = self._free.pop()
+        try:
+            return self.models[slot].transcribe(utt.float32, language='en')["text"].strip()
+        finally:
+            with self._lock:
+                self._free.append(slot)
+
+ENGINES = {"vosk": VoskEngine, "whisper": WhisperEngine}
+
+def build_engine(spec, workers):
+    kind, _, target = spec.partition(":")
+    if kind not in ENGINES or not target:
+        raise ValueError(f"Invalid engine spec '{spec}' (expected vosk:<model_dir> or whisper:<size>)")
+    return ENGINES[kind](target, workers)
+
+# ---------- Main ----------
+def main():
+    parser = argparse.ArgumentParser(description="Compare ASR engines on a dataset CSV in a single pass")
+    parser.add_argument("--input_csv", default="dataset.csv", help="Dataset CSV with audio_path and ground_truth")
+    parser.add_argument("--engine", action="append", required=True,
+                        help="Engine spec, repeatable: vosk:<model_dir> or whisper:<size>")
+    parser.add_argument("--workers", type=int, default=1, help="Worker threads per engine")
+    parser.add_argument("--output", default="engine_comparison.csv", help="Output CSV file for joined results")
+    args = parser.parse_args()
+
+    if not os.path.isfile(args.input_csv):
+        print(f"❌ Dataset CSV not found: {args.input_csv}")
+        return
+    if shutil.which("ffmpeg") is None:
+        print("❌ ffmpeg not found. Install it and make sure it is on your PATH.")
+        return
+
+    engines = []
+    for spec in args.engine:
+        print(f"🔹 Loading engine '{spec}'...")
+        try:
+            engines.append(build_engine(spec, args.workers))
+        except Exception as e:
+            print(f"❌ Error loading engine '{spec}': {e}")
+            return
+
+    df = pd.read_csv(args.input_csv)
+    df['normalized_gt'] = normalized_references(df)
+    hypotheses = {e.name: [None] * len(df) for e in engines}
+    # Failures are recorded here, never as hypothesis text, so they aren't scored.
+    statuses = {e.name: ["ok"] * len(df) for e in engines}
+    busy = {e.name: 0.0 for e in engines}
+    busy_lock = threading.Lock()
+    in_flight = threading.BoundedSemaphore(MAX_IN_FLIGHT)
+
+    def run(engine, index, utt, remaining):
+        t0 = time.perf_counter()
+        try:
+            hypotheses[engine.name][index] = engine.transcribe(utt)
+        except Exception as e:
+            print(f"❌ {engine.name} failed on row {index}: {e}")
+            statuses[engine.name][index] = "TRANSCRIPTION_ERROR"
+        with busy_lock:
+            busy[engine.name] += time.perf_counter() - t0
+            remaining[0] -= 1
+            done = remaining[0] == 0
+        if done:
+            in_flight.release()
+
+    print(f"🚀 Comparing {len(engines)} engine(s) on {len(df)} utterance(s)...")
+    start = time.perf_counter()
+    futures = []
+    for index, audio_path in enumerate(df['audio_path']):
+        if not os.path.isfile(audio_path):
+            print(f"❌ Audio file not found, skipping: {audio_path}")
+            for e in engines:
+                statuses[e.name][index] = "FILE_NOT_FOUND_ERROR"
+            continue
+        try:
+            utt = Utterance(decode_audio(audio_path))
+        except (subprocess.CalledProcessError, OSError) as e:
+            print(f"❌ Error decoding {audio_path}: {e}")
+            for eng in engines:
+                statuses[eng.name][index] = "DECODE_ERROR"
+            continue
+
+        # Bound the number of decoded utterances held in memory.
+        in_flight.acquire()
+        remaining = [len(engines)]
+        for engine in engines:
+            futures.append(engine.pool.submit(run, engine, index, utt, remaining))
+        if (index + 1) % 100 == 0:
+            print(f"  Decoded {index + 1}/{len(df)}")
+
+    for f in futures:
+        f.result()
+    for engine in engines:
+        engine.pool.shutdown()
+    wall = time.perf_counter() - start
+
+    print("\n--- Engine Comparison ---")
+    for engine in engines:
+        hyps = hypotheses[engine.name]
+        status = statuses[engine.name]
+        norm_hyps = normalize_batch(hyps)
+        ok = [s == "ok" and bool(gt) for s, gt in zip(status, df['normalized_gt'])]
+        df[f"{engine.name}_hypothesis"] = hyps
+        df[f"{engine.name}_status"] = status
+        df[f"{engine.name}_wer"] = [jiwer.wer(gt, hyp) if keep else np.nan
+                                    for gt, hyp, keep in zip(df['normalized_gt'], norm_hyps, ok)]
+        scored = [(gt, hyp) for gt, hyp, keep in zip(df['normalized_gt'], norm_hyps, ok) if keep]
+        corpus_wer = jiwer.wer([g for g, _ in scored], [h for _, h in scored]) if scored else float("nan")
+        failed = sum(s != "ok" for s in status)
+        print(f"✅ {engine.name}: corpus WER {corpus_wer * 100:.2f}% "
+              f"(mean {df[f'{engine.name}_wer'].mean() * 100:.2f}%, busy {busy[engine.name]:.1f}s"
+              f"{f', {failed} failed row(s) excluded' if failed else ''})")
+    print(f"⏱️ Wall time: {wall:.1f}s (sum of engine busy time: {sum(busy.values()):.1f}s)")
+
+    df.to_csv(args.output, index=False)
+    print(f"📄 Joined results saved to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,18 @@
 #!/usr/bin/env python3
 """
 Diarize an audio file with Pyannote and transcribe each speaker using Whisper.
+
+Diarization results (RTTM + speaker embeddings) are cached on disk, keyed by the
+audio content hash, the pipeline name and its parameters, so re-running with a
+different Whisper model skips the diarization stage entirely.
 """
 
 import os
+import json
+import shutil
+import hashlib
 import argparse
+import tempfile
 import whisper
 import torch
 import soundfile as sf
@@ -13,21 +21,102 @@ from pyannote.audio import Pipeline
 
 # --- Config ---
 WHISPER_MODEL_SIZE = "base.en"
+DIARIZATION_PIPELINE = "pyannote/speaker-diarization-3.1"
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "meeting_summarizer", "diarization")
 HUGGING_FACE_TOKEN = os.environ.get("HUGGING_FACE_HUB_TOKEN")
-if not HUGGING_FACE_TOKEN:
-    print("❌ Hugging Face token not found. Set HUGGING_FACE_HUB_TOKEN.")
-    exit()
 
-def diarize_and_transcribe(audio_path, whisper_model_size):
+def hash_audio(audio_path, block_size=1 << 20):
+    """SHA-256 of the audio file contents."""
+    h = hashlib.sha256()
+    with open(audio_path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def diarization_cache_key(audio_hash, pipeline_name, params):
+    """Cache key combining audio content, pipeline name and pipeline parameters."""
+    import pyannote.audio
+    payload = json.dumps({
+        "audio": audio_hash,
+        "pipeline": pipeline_name,
+        "params": params,
+        "pyannote": pyannote.audio.__version__,
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def _load_cached(entry_dir, uri):
+    from pyannote.core import Annotation
+    from pyannote.database.util import load_rttm
+    data = np.load(os.path.join(entry_dir, "embeddings.npz"))
+    labels = [str(label) for label in data["labels"]]
+    if not labels:
+        # No speech detected: the stored RTTM is empty and can't be parsed back.
+        return Annotation(uri=uri), [], data["embeddings"]
+    annotations = load_rttm(os.path.join(entry_dir, "diarization.rttm"))
+    diarization = next(iter(annotations.values()))
+    diarization.uri = uri
+    return diarization, labels, data["embeddings"]
+
+def _store_cached(entry_dir, diarization, labels, embeddings, meta):
+    """Write a cache entry into a temp dir and rename it into place atomically."""
+    parent = os.path.dirname(entry_dir)
+    os.makedirs(parent, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(dir=parent, prefix=".tmp-")
+    try:
+        with open(os.path.join(tmp_dir, "diarization.rttm"), "w") as f:
+            diarization.write_rttm(f)
+        if not labels:
+            embeddings = np.zeros((0, 0), dtype=np.float32)
+        np.savez(os.path.join(tmp_dir, "embeddings.npz"),
+                 labels=np.array(labels, dtype=str), embeddings=np.asarray(embeddings, dtype=np.float32))
+        with open(os.path.join(tmp_dir, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+        os.replace(tmp_dir, entry_dir)
+    except OSError:
+        # Another job stored the same entry first; keep theirs.
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+def diarize(audio_path, pipeline_name=DIARIZATION_PIPELINE, params=None,
+            cache_dir=CACHE_DIR, refresh=False):
+    """
+    Return (diarization, labels, embeddings) for an audio file, using the on-disk
+    cache when possible. `params` are passed to the pipeline call (e.g. num_speakers).
+    The cache key only names the cache entry; the returned annotation's uri is the
+    audio file stem, so RTTM file-ids match reference RTTMs.
+    """
+    uri = os.path.splitext(os.path.basename(audio_path))[0]
+    params = {k: v for k, v in (params or {}).items() if v is not None}
+    audio_hash = hash_audio(audio_path)
+    key = diarization_cache_key(audio_hash, pipeline_name, params)
+    entry_dir = os.path.join(cache_dir, key[:2], key)
+
+    if not refresh and os.path.isdir(entry_dir):
+        print(f"🔹 Using cached diarization ({key[:12]})")
+        return _load_cached(entry_dir, uri)
+
+    if not HUGGING_FACE_TOKEN:
+        raise RuntimeError("Hugging Face token not found. Set HUGGING_FACE_HUB_TOKEN.")
+
     print("🔹 Loading Pyannote diarization model...")
-    diarization_pipeline = Pipeline.from_pretrained(
-        "pyannote/speaker-diarization-3.1",
-        use_auth_token=HUGGING_FACE_TOKEN
-    )
+    diarization_pipeline = Pipeline.from_pretrained(pipeline_name, use_auth_token=HUGGING_FACE_TOKEN)
 
     print(f"🔹 Running diarization on {audio_path}...")
-    diarization_result = diarization_pipeline(audio_path)
+    diarization, embeddings = diarization_pipeline(audio_path, return_embeddings=True, **params)
+    diarization.uri = uri
+    labels = diarization.labels()
+
+    if refresh and os.path.isdir(entry_dir):
+        shutil.rmtree(entry_dir, ignore_errors=True)
+    _store_cached(entry_dir, diarization, labels, embeddings, {
+        "audio_path": os.path.abspath(audio_path),
+        "audio_sha256": audio_hash,
+        "pipeline": pipeline_name,
+        "params": params,
+    })
+    return diarization, labels, embeddings
 
+def transcribe_segments(audio_path, diarization, whisper_model_size):
+    """Transcribe every diarized turn with Whisper; returns "[SPEAKER]: text" lines."""
     print(f"🔹 Loading Whisper model '{whisper_model_size}'...")
     whisper_model = whisper.load_model(whisper_model_size)
 
@@ -35,7 +124,7 @@ def diarize_and_transcribe(audio_path, whisper_model_size):
     transcriptions = []
 
     print("🔹 Transcribing speaker segments...")
-    for turn, _, speaker in diarization_result.itertracks(yield_label=True):
+    for turn, _, speaker in diarization.itertracks(yield_label=True):
         start_sample = int(turn.start * 16000)
         end_sample = int(turn.end * 16000)
         segment_audio = full_audio[start_sample:end_sample]
@@ -43,14 +132,29 @@ def diarize_and_transcribe(audio_path, whisper_model_size):
         segment_text = whisper_model.transcribe(segment_audio.astype(np.float32))["text"].strip()
         transcriptions.append(f"[{speaker}]: {segment_text}")
 
+    return transcriptions
+
+def output_paths(audio_path, output_dir=None):
+    """RTTM and transcript paths derived from the audio file name."""
+    output_dir = output_dir or os.path.dirname(os.path.abspath(audio_path))
+    stem = os.path.splitext(os.path.basename(audio_path))[0]
+    return (os.path.join(output_dir, f"{stem}.rttm"),
+            os.path.join(output_dir, f"{stem}.diarized.txt"))
+
+def diarize_and_transcribe(audio_path, whisper_model_size, output_dir=None,
+                           cache_dir=CACHE_DIR, params=None, refresh=False):
+    diarization, _, _ = diarize(audio_path, params=params, cache_dir=cache_dir, refresh=refresh)
+    transcriptions = transcribe_segments(audio_path, diarization, whisper_model_size)
+
+    rttm_path, transcript_path = output_paths(audio_path, output_dir)
+    os.makedirs(os.path.dirname(rttm_path), exist_ok=True)
+
     # Save RTTM file
-    rttm_path = "output.rttm"
     with open(rttm_path, "w") as f:
-        diarization_result.write_rttm(f)
+        diarization.write_rttm(f)
     print(f"✅ Diarization saved to {rttm_path}")
 
     # Save full transcript
-    transcript_path = "diarized_transcript.txt"
     full_transcript = "\n".join(transcriptions)
     with open(transcript_path, "w", encoding="utf-8") as f:
         f.write(full_transcript)
@@ -62,6 +166,12 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Diarize & transcribe an audio file")
     parser.add_argument("--audio", required=True, help="Path to audio file (16kHz mono WAV)")
     parser.add_argument("--model", default=WHISPER_MODEL_SIZE, help="Whisper model size")
+    parser.add_argument("--output-dir", default=None, help="Directory for RTTM/transcript (default: next to the audio)")
+    parser.add_argument("--cache-dir", default=CACHE_DIR, help="Diarization cache directory")
+    parser.add_argument("--refresh", action="store_true", help="Ignore cached diarization and recompute it")
+    parser.add_argument("--num-speakers", type=int, default=None, help="Known number of speakers")
+    parser.add_argument("--min-speakers", type=int, default=None, help="Minimum number of speakers")
+    parser.add_argument("--max-speakers", type=int, default=None, help="Maximum number of speakers")
     args = parser.parse_args()
 
     if not os.path.isfile(args.audio):
@@ -72,6 +182,17 @@ if __name__ == "__main__":
         print("❌ Audio must be 16kHz mono WAV.")
         exit()
 
-    final_transcript = diarize_and_transcribe(args.audio, args.model)
+    pipeline_params = {
+        "num_speakers": args.num_speakers,
+        "min_speakers": args.min_speakers,
+        "max_speakers": args.max_speakers,
+    }
+    try:
+        final_transcript = diarize_and_transcribe(args.audio, args.model, output_dir=args.output_dir,
+                                                  cache_dir=args.cache_dir, params=pipeline_params,
+                                                  refresh=args.refresh)
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        exit()
     print("\n--- Final Transcript ---")
     print(final_transcript)
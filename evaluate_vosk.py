@@ -8,16 +8,9 @@ import argparse
 import os
 import wave
 import json
-import string
 from vosk import Model, KaldiRecognizer
 from jiwer import wer
-
-def normalize_text(text: str) -> str:
-    """Lowercase, remove punctuation, trim extra spaces."""
-    text = text.lower()
-    text = text.translate(str.maketrans("", "", string.punctuation))
-    text = " ".join(text.split())
-    return text
+from text_normalizer import normalize_text
 
 def transcribe_wav(model_path, wav_path):
     wf = wave.open(wav_path, "rb")
@@ -6,16 +6,9 @@ Transcribe a WAV file with Whisper and compute WER against a ground-truth text f
 
 import argparse
 import os
-import string
 import whisper
 import jiwer
-
-def normalize_text(text: str) -> str:
-    """Lowercase, remove punctuation, trim extra spaces."""
-    text = text.lower()
-    text = text.translate(str.maketrans("", "", string.punctuation))
-    text = " ".join(text.split())
-    return text
+from text_normalizer import normalize_text
 
 def main():
     parser = argparse.ArgumentParser(description="Evaluate Whisper transcription WER")
@@ -1,35 +1,31 @@
 import os
 import csv
 import argparse
-import string
-
-def normalize_text(text: str) -> str:
-    """Lowercase, remove punctuation, trim extra spaces."""
-    text = text.lower()
-    text = text.translate(str.maketrans("", "", string.punctuation))
-    text = " ".join(text.split())
-    return text
+from text_normalizer import NORMALIZER_VERSION, normalize_batch
 
 def create_dataset_csv(input_dir, output_csv):
-    """Generate CSV with audio paths and transcripts."""
+    """Generate CSV with audio paths, transcripts and memoized normalized transcripts."""
+    rows = []
+    for root, dirs, files in os.walk(input_dir):
+        for file in files:
+            if file.endswith('.trans.txt'):
+                trans_path = os.path.join(root, file)
+                print(f"📄 Parsing transcript: {trans_path}")
+                with open(trans_path, 'r', encoding='utf-8') as trans_f:
+                    for line in trans_f:
+                        parts = line.strip().split(' ', 1)
+                        if len(parts) == 2:
+                            file_id, text = parts
+                            audio_file = f"{file_id}.flac"
+                            audio_path = os.path.join(root, audio_file)
+                            rows.append((audio_path, text))
+
+    normalized = normalize_batch([text for _, text in rows])
     with open(output_csv, 'w', newline='', encoding='utf-8') as f:
         writer = csv.writer(f)
-        writer.writerow(['audio_path', 'ground_truth', 'normalized_gt'])
-
-        for root, dirs, files in os.walk(input_dir):
-            for file in files:
-                if file.endswith('.trans.txt'):
-                    trans_path = os.path.join(root, file)
-                    print(f"📄 Parsing transcript: {trans_path}")
-                    with open(trans_path, 'r', encoding='utf-8') as trans_f:
-                        for line in trans_f:
-                            parts = line.strip().split(' ', 1)
-                            if len(parts) == 2:
-                                file_id, text = parts
-                                audio_file = f"{file_id}.flac"
-                                audio_path = os.path.join(root, audio_file)
-                                normalized_text = normalize_text(text)
-                                writer.writerow([audio_path, text, normalized_text])
+        writer.writerow(['audio_path', 'ground_truth', 'normalized_gt', 'normalizer'])
+        for (audio_path, text), normalized_text in zip(rows, normalized):
+            writer.writerow([audio_path, text, normalized_text, NORMALIZER_VERSION])
 
     print(f"\n✅ Dataset CSV created successfully at {output_csv}")
 
@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+One command from recording to summary: diarize -> transcribe -> summarize.
+
+The recording is decoded by ffmpeg (any format, so no separate flac_to_wav step)
+and streamed in fixed-size chunks (with a few seconds of overlap, so each chunk can
+be cut in a pause between turns) through three stage threads connected by bounded
+queues. While chunk N is being transcribed, chunk N+1 is diarized and completed
+chunks are summarized, so wall time approaches the slowest stage instead of the sum.
+Speaker labels are linked across chunks by matching their embedding centroids.
+
+Usage:
+  python meeting_pipeline.py --audio meeting.flac
+  python meeting_pipeline.py --audio meeting.wav --model small.en --chunk-seconds 300 --speaker-index speaker_index
+"""
+
+import os
+import time
+import queue
+import argparse
+import threading
+import subprocess
+import numpy as np
+
+SAMPLE_RATE = 16000
+CHUNK_SECONDS = 120
+OVERLAP_SECONDS = 10
+QUEUE_SIZE = 2
+MIN_TURN_SECONDS = 0.2
+LINK_THRESHOLD = 0.5
+
+class Chunk:
+    def __init__(self, index, offset, audio, span, last):
+        self.index = index
+        self.offset = offset      # seconds from the start of the recording
+        self.audio = audio        # float32 mono samples at SAMPLE_RATE, span + overlap long
+        self.span = span          # seconds before the next chunk's offset
+        self.last = last
+        self.turns = []           # (speaker, start, end), relative to the chunk
+        self.lines = []           # (speaker, start, end, text), absolute times
+        self.summary = ""
+
+def stream_chunks(audio_path, chunk_seconds=CHUNK_SECONDS, overlap_seconds=OVERLAP_SECONDS):
+    """
+    Decode any ffmpeg-readable file and yield Chunks of 16kHz mono audio starting every
+    chunk_seconds, each extended by overlap_seconds of the following audio.
+    """
+    proc = subprocess.Popen([
+        'ffmpeg', '-nostdin', '-loglevel', 'error', '-i', audio_path,
+        '-f', 's16le', '-ac', '1', '-ar', str(SAMPLE_RATE), '-'
+    ], stdout=subprocess.PIPE)
+    step_bytes = chunk_seconds * SAMPLE_RATE * 2
+    window_bytes = (chunk_seconds + overlap_seconds) * SAMPLE_RATE * 2
+    pending = b""
+    eof = False
+    index = 0
+    try:
+        while True:
+            # Read one sample past the window so we know whether this is the last chunk.
+            while not eof and len(pending) < window_bytes + 2:
+                data = proc.stdout.read(window_bytes + 2 - len(pending))
+                if not data:
+                    eof = True
+                pending += data
+            if not pending:
+                break
+            last = len(pending) <= window_bytes
+            audio = np.frombuffer(pending[:window_bytes], dtype=np.int16).astype(np.float32) / 32768.0
+            yield Chunk(index, index * chunk_seconds, audio, chunk_seconds, last)
+            if last:
+                break
+            pending = pending[step_bytes:]
+            index += 1
+    finally:
+        proc.stdout.close()
+        returncode = proc.wait()
+    if returncode != 0:
+        raise RuntimeError(f"ffmpeg exited with code {returncode}")
+
+class SpeakerLinker:
+    """Map per-chunk diarization labels to recording-wide speakers via embedding centroids."""
+
+    def __init__(self, threshold=LINK_THRESHOLD, speaker_index=None):
+        self.threshold = threshold
+        self.speaker_index = speaker_index
+        self.labels = []
+        self.centroids = []
+        self.counts = []
+
+    def _new_speaker(self, embedding):
+        label = f"SPEAKER_{len(self.labels):02d}"
+        if self.speaker_index is not None and embedding is not None:
+            name, _ = self.speaker_index.search(embedding)[0]
+            if name and name not in self.labels:
+                label = name
+        self.labels.append(label)
+        self.centroids.append(embedding)
+        self.counts.append(1 if embedding is not None else 0)
+        return label
+
+    def assign(self, labels, embeddings):
+        """
+        Recording-wide speaker per label; None for labels without a usable embedding
+        (missing, NaN, or the all-zero rows pyannote returns for labels it has no centroid for).
+        """
+        mapping = {}
+        used = set()
+        known = [i for i, c in enumerate(self.centroids) if c is not None]
+        for label, emb in zip(labels, embeddings):
+            if emb is None or np.isnan(emb).any() or not np.any(emb):
+                mapping[label] = None
+                continue
+            emb = emb / (np.linalg.norm(emb) or 1.0)
+            best, best_sim = None, self.threshold
+            if known:
+                sims = np.stack([self.centroids[i] for i in known]) @ emb
+                for k in np.argsort(-sims):
+                    if sims[k] < best_sim:
+                        break
+                    if known[k] not in used:
+                        best, best_sim = known[k], sims[k]
+                        break
+            if best is None:
+                mapping[label] = self._new_speaker(emb)
+                continue
+            # Running mean of normalized embeddings, renormalized.
+            n = self.counts[best]
+            centroid = (self.centroids[best] * n + emb) / (n + 1)
+            self.centroids[best] = centroid / (np.linalg.norm(centroid) or 1.0)
+            self.counts[best] = n + 1
+            used.add(best)
+            mapping[label] = self.labels[best]
+        return mapping
+
+# ---------- Stages ----------
+def find_cut(turns, earliest, latest):
+    """First time in [earliest, latest) not covered by any turn, or None if speech runs through."""
+    t = earliest
+    for start, end in sorted((s, e) for _, s, e in turns):
+        if start > t:
+            break
+        t = max(t, end)
+    return t if t < latest else None
+
+def clip_turns(turns, skip, cut):
+    """
+    Turns overlapping [skip, cut), clipped to it. A turn crossing the cut keeps its
+    part before the cut here; the next chunk, which resumes at the cut, gets the rest.
+    """
+    clipped = []
+    for speaker, start, end in turns:
+        if end <= skip or start >= cut:
+            continue
+        start, end = max(start, skip), min(end, cut)
+        if end - start >= MIN_TURN_SECONDS:
+            clipped.append((speaker, start, end))
+    return clipped
+
+def resolve_unknown(turns, fallback=None):
+    """
+    Give turns without a linked speaker (None) the known speaker overlapping them most,
+    else the latest known speaker before them, else `fallback`; drop them otherwise.
+    """
+    known = [t for t in turns if t[0] is not None]
+    resolved = []
+    for speaker, start, end in turns:
+        if speaker is None:
+            overlaps = [(min(end, e) - max(start, s), k) for k, s, e in known if s < end and start < e]
+            before = [(e, k) for k, s, e in known if e <= start]
+            if overlaps:
+                speaker = max(overlaps)[1]
+            elif before:
+                speaker = max(before)[1]
+            else:
+                speaker = fallback
+            if speaker is None:
+                continue
+        resolved.append((speaker, start, end))
+    return resolved
+
+class DiarizeStage:
+    def __init__(self, linker):
+        from pyannote.audio import Pipeline
+        from diarize_whisper import DIARIZATION_PIPELINE, HUGGING_FACE_TOKEN
+        if not HUGGING_FACE_TOKEN:
+            raise RuntimeError("Hugging Face token not found. Set HUGGING_FACE_HUB_TOKEN.")
+        print("🔹 Loading Pyannote diarization model...")
+        self.pipeline = Pipeline.from_pretrained(DIARIZATION_PIPELINE, use_auth_token=HUGGING_FACE_TOKEN)
+        self.linker = linker
+        self.resume_at = 0.0  # absolute time up to which previous chunks own the turns
+        self.last_speaker = None  # latest known speaker, for labels without an embedding
+
+    def __call__(self, chunk):
+        import torch
+        waveform = torch.from_numpy(chunk.audio).unsqueeze(0)
+        diarization, embeddings = self.pipeline({"waveform": waveform, "sample_rate": SAMPLE_RATE},
+                                                return_embeddings=True)
+        labels = diarization.labels()
+        mapping = self.linker.assign(labels, list(embeddings) if embeddings is not None else [None] * len(labels))
+        raw = [(mapping[speaker], turn.start, turn.end)
+               for turn, _, speaker in diarization.itertracks(yield_label=True)]
+
+        # The previous chunk already covered everything before resume_at. This chunk
+        # ends at a pause inside its overlap window when there is one, so turns and
+        # words aren't split between two independent Whisper calls.
+        skip = max(0.0, self.resume_at - chunk.offset)
+        duration = len(chunk.audio) / SAMPLE_RATE
+        if chunk.last:
+            cut = duration
+        else:
+            cut = find_cut(raw, chunk.span, duration)
+            if cut is None:
+                cut = chunk.span
+        self.resume_at = chunk.offset + cut
+
+        # Labels pyannote couldn't embed (too little clean speech) would otherwise each
+        # become a new speaker; attribute them to a known one instead.
+        chunk.turns = clip_turns(resolve_unknown(raw, self.last_speaker), skip, cut)
+        if chunk.turns:
+            self.last_speaker = max(chunk.turns, key=lambda t: t[2])[0]
+
+class TranscribeStage:
+    def __init__(self, model_size):
+        import whisper
+        print(f"🔹 Loading Whisper model '{model_size}'...")
+        self.model = whisper.load_model(model_size)
+
+    def __call__(self, chunk):
+        for speaker, start, end in chunk.turns:
+            segment_audio = chunk.audio[int(start * SAMPLE_RATE):int(end * SAMPLE_RATE)]
+            text = self.model.transcribe(segment_audio, language='en')["text"].strip()
+            chunk.lines.append((speaker, chunk.offset + start, chunk.offset + end, text))
+        chunk.audio = None  # no later stage needs the samples
+
+class SummarizeStage:
+    def __init__(self):
+        from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
+        from summarizer import MODEL_NAME
+        import torch
+        print(f"🔹 Loading tokenizer and model: {MODEL_NAME}...")
+        self.tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
+        self.model = AutoModelForSeq2SeqLM.from_pretrained(MODEL_NAME)
+        self.model.to("cuda" if torch.cuda.is_available() else "cpu")
+        self.model.eval()
+
+    def summarize(self, texts):
+        from summarizer import summarize_texts
+        summaries, _ = summarize_texts(self.tokenizer, self.model, texts)
+        return summaries
+
+    def __call__(self, chunk):
+        text = "\n".join(f"[{speaker}]: {line}" for speaker, _, _, line in chunk.lines if line)
+        if text:
+            chunk.summary = self.summarize([text])[0]
+
+def _run_stage(name, fn, q_in, q_out, busy, errors):
+    """Pull chunks from q_in, process them, pass them on; None is the end-of-stream marker."""
+    while True:
+        chunk = q_in.get()
+        if chunk is None:
+            q_out.put(None)
+            return
+        if errors:
+            continue  # keep draining so upstream stages never block on a full queue
+        t0 = time.perf_counter()
+        try:
+            fn(chunk)
+        except Exception as e:
+            errors.append(f"{name} failed on chunk {chunk.index}: {e}")
+            continue
+        busy[name] += time.perf_counter() - t0
+        print(f"  ✅ {name} chunk {chunk.index} ({time.perf_counter() - t0:.1f}s)")
+        q_out.put(chunk)
+
+# ---------- Main ----------
+def write_outputs(audio_path, chunks, final_summary, output_dir=None):
+    output_dir = output_dir or os.path.dirname(os.path.abspath(audio_path))
+    os.makedirs(output_dir, exist_ok=True)
+    stem = os.path.splitext(os.path.basename(audio_path))[0]
+    rttm_path = os.path.join(output_dir, f"{stem}.rttm")
+    transcript_path = os.path.join(output_dir, f"{stem}.diarized.txt")
+    summary_path = os.path.join(output_dir, f"{stem}.summary.txt")
+
+    lines = [line for chunk in chunks for line in chunk.lines]
+    # One RTTM turn per transcript line, in the same order.
+    with open(rttm_path, "w") as f:
+        for speaker, start, end, _ in lines:
+            f.write(f"SPEAKER {stem} 1 {start:.3f} {end - start:.3f} <NA> <NA> {speaker} <NA> <NA>\n")
+    with open(transcript_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(f"[{speaker}]: {text}" for speaker, _, _, text in lines))
+    with open(summary_path, "w", encoding="utf-8") as f:
+        f.write(final_summary)
+    return rttm_path, transcript_path, summary_path
+
+def run_pipeline(audio_path, model_size="base.en", chunk_seconds=CHUNK_SECONDS, output_dir=None,
+                 speaker_index=None, overlap_seconds=OVERLAP_SECONDS):
+    linker = SpeakerLinker(speaker_index=speaker_index)
+    diarize = DiarizeStage(linker)
+    transcribe = TranscribeStage(model_size)
+    summarize = SummarizeStage()
+
+    stages = [("diarize", diarize), ("transcribe", transcribe), ("summarize", summarize)]
+    queues = [queue.Queue(maxsize=QUEUE_SIZE) for _ in range(len(stages) + 1)]
+    busy = {name: 0.0 for name, _ in stages}
+    errors = []
+    threads = [threading.Thread(target=_run_stage, args=(name, fn, queues[i], queues[i + 1], busy, errors),
+                                daemon=True)
+               for i, (name, fn) in enumerate(stages)]
+
+    print(f"🚀 Processing {audio_path} in {chunk_seconds}s chunks...")
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+
+    chunks = []
+    def collect():
+        while True:
+            chunk = queues[-1].get()
+            if chunk is None:
+                return
+            chunks.append(chunk)
+    collector = threading.Thread(target=collect, daemon=True)
+    collector.start()
+
+    try:
+        for chunk in stream_chunks(audio_path, chunk_seconds, overlap_seconds):
+            if errors:
+                break
+            queues[0].put(chunk)
+    except (RuntimeError, OSError) as e:
+        # OSError covers a missing ffmpeg binary; the stages still get their sentinel below.
+        errors.append(f"Error decoding {audio_path}: {e}")
+    finally:
+        queues[0].put(None)
+    collector.join()
+    for t in threads:
+        t.join()
+    if errors:
+        raise RuntimeError("; ".join(errors))
+
+    chunk_summaries = [c.summary for c in chunks if c.summary]
+    if len(chunk_summaries) > 1:
+        final_summary = summarize.summarize([" ".join(chunk_summaries)])[0]
+    else:
+        final_summary = chunk_summaries[0] if chunk_summaries else ""
+    wall = time.perf_counter() - start
+
+    paths = write_outputs(audio_path, chunks, final_summary, output_dir)
+    stage_times = ", ".join(f"{name} {t:.1f}s" for name, t in busy.items())
+    print(f"\n⏱️ Wall time {wall:.1f}s (stage busy time: {stage_times}; sum {sum(busy.values()):.1f}s)")
+    return final_summary, paths
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Diarize, transcribe and summarize a recording in one pipelined pass")
+    parser.add_argument("--audio", required=True, help="Path to the recording (any format ffmpeg can read)")
+    parser.add_argument("--model", default="base.en", help="Whisper model size")
+    parser.add_argument("--chunk-seconds", type=int, default=CHUNK_SECONDS, help="Seconds of audio per chunk")
+    parser.add_argument("--overlap-seconds", type=int, default=OVERLAP_SECONDS,
+                        help="Extra seconds per chunk used to cut it at a pause between turns")
+    parser.add_argument("--output-dir", default=None, help="Directory for outputs (default: next to the audio)")
+    parser.add_argument("--speaker-index", default=None, help="Speaker index directory to name enrolled speakers")
+    args = parser.parse_args()
+
+    if not os.path.isfile(args.audio):
+        print(f"❌ Audio file not found: {args.audio}")
+        exit()
+
+    index = None
+    if args.speaker_index:
+        from speaker_index import SpeakerIndex
+        index = SpeakerIndex(args.speaker_index)
+
+    try:
+        summary, (rttm_path, transcript_path, summary_path) = run_pipeline(
+            args.audio, args.model, args.chunk_seconds, args.output_dir, index, args.overlap_seconds)
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        exit()
+
+    print(f"✅ Diarization saved to {rttm_path}")
+    print(f"✅ Full transcript saved to {transcript_path}")
+    print(f"💾 Summary saved to {summary_path}")
+    print("\n✅ Generated Summary:")
+    print(summary)
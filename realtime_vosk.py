@@ -4,6 +4,7 @@ import queue
 import sys
 import json
 import datetime
+import wave
 import sounddevice as sd
 from vosk import Model, KaldiRecognizer
 
@@ -24,6 +25,7 @@ def main():
     parser.add_argument("--device", type=int, default=None, help="Input device index")
     parser.add_argument("--list-devices", action="store_true", help="List audio devices and exit")
     parser.add_argument("--blocksize", type=int, default=8000, help="Block size in frames (default 0.5s at 16kHz)")
+    parser.add_argument("--save-audio", action="store_true", help="Also save the captured audio as a 16-bit mono WAV")
     args = parser.parse_args()
 
     if args.list_devices:
@@ -38,6 +40,9 @@ def main():
     os.makedirs(transcripts_dir, exist_ok=True)
     timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
     output_path = os.path.join(transcripts_dir, f"transcript_{timestamp}.txt")
+    # Final results with per-word start/end/conf, one JSON object per line (append-only)
+    words_path = os.path.join(transcripts_dir, f"transcript_{timestamp}.jsonl")
+    audio_path = os.path.join(transcripts_dir, f"transcript_{timestamp}.wav")
 
     model = Model(args.model)
     rec = KaldiRecognizer(model, args.samplerate)
@@ -46,13 +51,22 @@ def main():
     print(f"🔹 Using model: {args.model}")
     print("🎤 Press Ctrl+C to stop. Listening to microphone...")
 
+    wav_out = None
+    if args.save_audio:
+        wav_out = wave.open(audio_path, "wb")
+        wav_out.setnchannels(1)
+        wav_out.setsampwidth(2)
+        wav_out.setframerate(args.samplerate)
+
     try:
-        with open(output_path, "a", encoding="utf-8") as fout:
+        with open(output_path, "a", encoding="utf-8") as fout, open(words_path, "a", encoding="utf-8") as wout:
             with sd.RawInputStream(samplerate=args.samplerate, blocksize=args.blocksize, dtype='int16',
                                    channels=1, callback=audio_callback, device=args.device):
                 print(f"Listening (sample rate: {args.samplerate}) ...")
                 while True:
                     data = q.get()
+                    if wav_out:
+                        wav_out.writeframes(data)
                     if rec.AcceptWaveform(data):
                         res = json.loads(rec.Result())
                         text = res.get("text", "").strip()
@@ -60,6 +74,8 @@ def main():
                             print("\n✅ FINAL:", text)
                             fout.write(text + "\n")
                             fout.flush()
+                            wout.write(json.dumps(res) + "\n")
+                            wout.flush()
                     else:
                         pres = json.loads(rec.PartialResult())
                         partial = pres.get("partial", "").strip()
@@ -74,10 +90,18 @@ def main():
             print("✅ FINAL (on exit):", final_text)
             with open(output_path, "a", encoding="utf-8") as fout:
                 fout.write(final_text + "\n")
+            with open(words_path, "a", encoding="utf-8") as wout:
+                wout.write(json.dumps(final) + "\n")
         print(f"💾 Transcript saved to: {output_path}")
+        print(f"💾 Word timings saved to: {words_path}")
+        if wav_out:
+            print(f"💾 Audio saved to: {audio_path}")
     except Exception as e:
         print("❌ Error:", str(e))
         raise
+    finally:
+        if wav_out:
+            wav_out.close()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Speaker enrollment index: map anonymous diarization labels (SPEAKER_00, ...) to names.
+
+Enrolled embeddings live in a flat float32 matrix on disk that is memory-mapped for
+search, with a small JSON sidecar holding the row -> name mapping. Adding appends
+rows (or reuses freed ones) and removing tombstones rows, so no rebuild is needed.
+
+Usage:
+  python speaker_index.py enroll --index speakers --name "Alice" --audio alice.wav
+  python speaker_index.py identify --index speakers --audio meeting.wav
+  python speaker_index.py remove --index speakers --name "Alice"
+"""
+
+import os
+import json
+import argparse
+import tempfile
+import numpy as np
+
+MATRIX_FILE = "embeddings.f32"
+META_FILE = "index.json"
+DEFAULT_THRESHOLD = 0.5
+
+def _l2_normalize(x):
+    norms = np.linalg.norm(x, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return x / norms
+
+class SpeakerIndex:
+    """Memory-mapped float32 embedding matrix with incremental add/remove."""
+
+    def __init__(self, index_dir, dim=None, normalize=True):
+        self.index_dir = index_dir
+        self.matrix_path = os.path.join(index_dir, MATRIX_FILE)
+        self.meta_path = os.path.join(index_dir, META_FILE)
+
+        if os.path.isfile(self.meta_path):
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            self.dim = meta["dim"]
+            self.normalize = meta["normalize"]
+            self.names = meta["names"]
+        else:
+            self.dim = dim
+            self.normalize = normalize
+            self.names = []
+        self._matrix = None
+        self._norms = None
+
+    # ---------- Storage ----------
+    def _save_meta(self):
+        os.makedirs(self.index_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.index_dir, prefix=".index-")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"dim": self.dim, "normalize": self.normalize, "names": self.names}, f)
+        os.replace(tmp_path, self.meta_path)
+
+    def _invalidate(self):
+        self._matrix = None
+        self._norms = None
+
+    @property
+    def matrix(self):
+        """(rows, dim) read-only memmap over the embedding file."""
+        if self._matrix is None and self.names:
+            self._matrix = np.memmap(self.matrix_path, dtype=np.float32, mode="r",
+                                     shape=(len(self.names), self.dim))
+        return self._matrix
+
+    @property
+    def active(self):
+        """Boolean mask of rows that are not tombstoned."""
+        return np.array([n is not None for n in self.names], dtype=bool)
+
+    def __len__(self):
+        return sum(n is not None for n in self.names)
+
+    # ---------- Mutation ----------
+    def add(self, name, embeddings):
+        """Enroll one or more embeddings (shape (dim,) or (n, dim)) under `name`."""
+        embeddings = np.atleast_2d(np.asarray(embeddings, dtype=np.float32))
+        embeddings = embeddings[~np.isnan(embeddings).any(axis=1)]
+        if len(embeddings) == 0:
+            raise ValueError(f"No valid embeddings to enroll for '{name}'.")
+        if self.dim is None:
+            self.dim = embeddings.shape[1]
+        elif embeddings.shape[1] != self.dim:
+            raise ValueError(f"Embedding dim {embeddings.shape[1]} does not match index dim {self.dim}.")
+        if self.normalize:
+            embeddings = _l2_normalize(embeddings)
+
+        os.makedirs(self.index_dir, exist_ok=True)
+        self._invalidate()
+        free_rows = [i for i, n in enumerate(self.names) if n is None]
+
+        # Reuse tombstoned rows first, then append the rest to the end of the file.
+        reused = min(len(free_rows), len(embeddings))
+        if reused:
+            mm = np.memmap(self.matrix_path, dtype=np.float32, mode="r+",
+                           shape=(len(self.names), self.dim))
+            mm[free_rows[:reused]] = embeddings[:reused]
+            mm.flush()
+            del mm
+            for row in free_rows[:reused]:
+                self.names[row] = name
+        if reused < len(embeddings):
+            with open(self.matrix_path, "ab") as f:
+                f.truncate(len(self.names) * self.dim * 4)
+                f.write(embeddings[reused:].tobytes())
+            self.names.extend([name] * (len(embeddings) - reused))
+
+        self._save_meta()
+
+    def remove(self, name):
+        """Tombstone every row enrolled under `name`; returns the number removed."""
+        rows = [i for i, n in enumerate(self.names) if n == name]
+        if not rows:
+            return 0
+        self._invalidate()
+        mm = np.memmap(self.matrix_path, dtype=np.float32, mode="r+",
+                       shape=(len(self.names), self.dim))
+        mm[rows] = 0.0
+        mm.flush()
+        del mm
+        for row in rows:
+            self.names[row] = None
+        self._save_meta()
+        return len(rows)
+
+    # ---------- Search ----------
+    def search(self, queries, threshold=DEFAULT_THRESHOLD):
+        """
+        Match each query embedding to its most similar enrolled speaker.
+        Returns a list of (name or None, cosine similarity) per query.
+        """
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        if not len(queries):
+            return []
+        if not len(self):
+            return [(None, 0.0)] * len(queries)
+
+        valid = ~np.isnan(queries).any(axis=1)
+        queries = _l2_normalize(np.nan_to_num(queries))
+
+        matrix = self.matrix
+        sims = queries @ matrix.T
+        if not self.normalize:
+            if self._norms is None:
+                self._norms = np.linalg.norm(matrix, axis=1)
+                self._norms[self._norms == 0] = 1.0
+            sims /= self._norms
+        sims[:, ~self.active] = -np.inf
+
+        best = sims.argmax(axis=1)
+        best_sims = sims[np.arange(len(queries)), best]
+        results = []
+        for ok, row, sim in zip(valid, best, best_sims):
+            if ok and sim >= threshold:
+                results.append((self.names[row], float(sim)))
+            else:
+                results.append((None, float(sim) if ok else 0.0))
+        return results
+
+    def identify(self, labels, embeddings, threshold=DEFAULT_THRESHOLD):
+        """Map diarization labels to enrolled names using their centroid embeddings."""
+        return dict(zip(labels, self.search(embeddings, threshold)))
+
+# ---------- Main ----------
+def _dominant_speaker(diarization):
+    durations = {label: diarization.label_duration(label) for label in diarization.labels()}
+    return max(durations, key=durations.get) if durations else None
+
+def main():
+    parser = argparse.ArgumentParser(description="Enroll and identify speakers across meetings")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    enroll = sub.add_parser("enroll", help="Enroll a speaker from an audio file")
+    enroll.add_argument("--name", required=True, help="Speaker name")
+    enroll.add_argument("--audio", required=True, help="Audio file (16kHz mono WAV)")
+    enroll.add_argument("--speaker", default=None, help="Diarization label to enroll (default: dominant speaker)")
+    enroll.add_argument("--no-normalize", action="store_true", help="Store raw embeddings (new index only)")
+
+    identify = sub.add_parser("identify", help="Name the diarized speakers of an audio file")
+    identify.add_argument("--audio", required=True, help="Audio file (16kHz mono WAV)")
+    identify.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Cosine similarity threshold")
+
+    remove = sub.add_parser("remove", help="Remove an enrolled speaker")
+    remove.add_argument("--name", required=True, help="Speaker name")
+
+    sub.add_parser("list", help="List enrolled speakers")
+
+    for p in (enroll, identify, remove, sub.choices["list"]):
+        p.add_argument("--index", default="speaker_index", help="Speaker index directory")
+    args = parser.parse_args()
+
+    if args.command == "list":
+        index = SpeakerIndex(args.index)
+        counts = {}
+        for name in index.names:
+            if name is not None:
+                counts[name] = counts.get(name, 0) + 1
+        for name, count in sorted(counts.items()):
+            print(f"{name}: {count} embedding(s)")
+        print(f"✅ {len(counts)} speaker(s) enrolled")
+        return
+
+    if args.command == "remove":
+        removed = SpeakerIndex(args.index).remove(args.name)
+        if removed:
+            print(f"✅ Removed {removed} embedding(s) for '{args.name}'")
+        else:
+            print(f"⚠️ No enrolled speaker named '{args.name}'")
+        return
+
+    if not os.path.isfile(args.audio):
+        print(f"❌ Audio file not found: {args.audio}")
+        return
+
+    from diarize_whisper import diarize
+    try:
+        diarization, labels, embeddings = diarize(args.audio)
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        return
+    if not len(labels):
+        print(f"❌ No speech detected in {args.audio}")
+        return
+
+    if args.command == "enroll":
+        index = SpeakerIndex(args.index, normalize=not args.no_normalize)
+        speaker = args.speaker or _dominant_speaker(diarization)
+        if speaker not in labels:
+            print(f"❌ Speaker '{speaker}' not found. Available: {', '.join(labels)}")
+            return
+        try:
+            index.add(args.name, embeddings[labels.index(speaker)])
+        except ValueError as e:
+            print(f"❌ {e}")
+            return
+        print(f"✅ Enrolled '{args.name}' from {speaker} in {args.audio}")
+    else:
+        index = SpeakerIndex(args.index)
+        for label, (name, sim) in index.identify(labels, embeddings, args.threshold).items():
+            print(f"{label} → {name or 'unknown'} (similarity {sim:.3f})")
+
+if __name__ == "__main__":
+    main()
@@ -1,48 +1,129 @@
 import os
+import glob
+import time
 import argparse
+import torch
 from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
 
 MODEL_NAME = "t5-small"  # Summarization model
+MAX_INPUT_TOKENS = 1024
+
+def summary_path_for(transcript_path):
+    """Summary is written next to its transcript: meeting.txt -> meeting.summary.txt"""
+    return os.path.splitext(transcript_path)[0] + ".summary.txt"
+
+def collect_transcripts(input_dir=None, manifest=None):
+    """Transcript paths from a directory (*.txt, skipping summaries) or a manifest file (one path per line)."""
+    paths = []
+    if input_dir:
+        for path in sorted(glob.glob(os.path.join(input_dir, "**", "*.txt"), recursive=True)):
+            if not path.endswith(".summary.txt"):
+                paths.append(path)
+    if manifest:
+        base = os.path.dirname(os.path.abspath(manifest))
+        with open(manifest, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    paths.append(line if os.path.isabs(line) else os.path.join(base, line))
+    return paths
+
+def build_chunks(tokenizer, texts, max_tokens=MAX_INPUT_TOKENS):
+    """
+    Tokenize each text once and split it into "summarize: ..." chunks of at most max_tokens.
+    Returns a list of (text_index, chunk_index, input_ids).
+    """
+    prefix_ids = tokenizer("summarize: ", add_special_tokens=False).input_ids
+    eos = [tokenizer.eos_token_id]
+    body_len = max_tokens - len(prefix_ids) - len(eos)
+
+    chunks = []
+    encoded = tokenizer(texts, add_special_tokens=False).input_ids
+    for text_index, ids in enumerate(encoded):
+        pieces = [ids[i:i + body_len] for i in range(0, len(ids), body_len)] or [[]]
+        for chunk_index, piece in enumerate(pieces):
+            chunks.append((text_index, chunk_index, prefix_ids + piece + eos))
+    return chunks
+
+def summarize_texts(tokenizer, model, texts, batch_size=8, max_tokens=MAX_INPUT_TOKENS):
+    """
+    Summarize many texts with length-bucketed, dynamically padded beam-search batches.
+    Long texts are split into chunks whose summaries are joined in order.
+    Returns (summaries, input_token_count).
+    """
+    chunks = build_chunks(tokenizer, texts, max_tokens)
+    # Sort by length so each batch pads to a similar size.
+    order = sorted(range(len(chunks)), key=lambda i: len(chunks[i][2]))
+    chunk_summaries = [None] * len(chunks)
+
+    for start in range(0, len(order), batch_size):
+        batch_ids = order[start:start + batch_size]
+        batch = tokenizer.pad({"input_ids": [chunks[i][2] for i in batch_ids]}, return_tensors="pt")
+        batch = {k: v.to(model.device) for k, v in batch.items()}
+        summary_ids = model.generate(
+            **batch,
+            max_length=150,
+            min_length=40,
+            num_beams=4,
+            early_stopping=True
+        )
+        for i, text in zip(batch_ids, tokenizer.batch_decode(summary_ids, skip_special_tokens=True)):
+            chunk_summaries[i] = text
+
+    per_text = [[] for _ in texts]
+    for (text_index, chunk_index, _), summary in zip(chunks, chunk_summaries):
+        per_text[text_index].append((chunk_index, summary))
+    summaries = [" ".join(s for _, s in sorted(parts)) for parts in per_text]
+    return summaries, sum(len(c[2]) for c in chunks)
 
 def main():
     parser = argparse.ArgumentParser(description="Generate summary from diarized transcript")
-    parser.add_argument("--transcript", required=True, help="Path to transcript file")
+    parser.add_argument("--transcript", help="Path to transcript file")
+    parser.add_argument("--input-dir", help="Summarize every *.txt transcript under this directory")
+    parser.add_argument("--manifest", help="Text file listing transcript paths, one per line")
+    parser.add_argument("--batch-size", type=int, default=8, help="Chunks per generate() batch")
     args = parser.parse_args()
 
-    INPUT_FILE = args.transcript
+    if not (args.transcript or args.input_dir or args.manifest):
+        parser.error("one of --transcript, --input-dir or --manifest is required")
+
+    transcript_paths = [args.transcript] if args.transcript else []
+    transcript_paths += collect_transcripts(args.input_dir, args.manifest)
 
-    if not os.path.isfile(INPUT_FILE):
-        print(f"❌ Transcript file not found: {INPUT_FILE}")
+    texts, paths = [], []
+    for path in transcript_paths:
+        if not os.path.isfile(path):
+            print(f"❌ Transcript file not found: {path}")
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            texts.append(f.read())
+        paths.append(path)
+    if not paths:
+        print("❌ No transcripts to summarize.")
         exit()
 
     print(f"🔹 Loading tokenizer and model: {MODEL_NAME}...")
     tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
     model = AutoModelForSeq2SeqLM.from_pretrained(MODEL_NAME)
+    model.to("cuda" if torch.cuda.is_available() else "cpu")
+    model.eval()
 
-    with open(INPUT_FILE, "r", encoding="utf-8") as f:
-        transcript_text = f.read()
-
-    processed_text = "summarize: " + transcript_text
-    inputs = tokenizer(processed_text, return_tensors="pt", max_length=1024, truncation=True)
-
-    print("⏳ Generating summary...")
-    summary_ids = model.generate(
-        inputs.input_ids,
-        max_length=150,
-        min_length=40,
-        num_beams=4,
-        early_stopping=True
-    )
-
-    output_summary = tokenizer.decode(summary_ids[0], skip_special_tokens=True)
+    print(f"⏳ Generating {len(paths)} summary(ies)...")
+    start = time.perf_counter()
+    summaries, token_count = summarize_texts(tokenizer, model, texts, batch_size=args.batch_size)
+    elapsed = time.perf_counter() - start
 
-    print("\n✅ Generated Summary:")
-    print(output_summary)
+    for path, output_summary in zip(paths, summaries):
+        output_path = summary_path_for(path)
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write(output_summary)
+        if len(paths) == 1:
+            print("\n✅ Generated Summary:")
+            print(output_summary)
+        print(f"💾 Summary saved to {output_path}")
 
-    output_path = "summary_output.txt"
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write(output_summary)
-    print(f"💾 Summary saved to {output_path}")
+    print(f"\n⏱️ {len(paths) / elapsed:.2f} transcripts/sec, {token_count / elapsed:.1f} tokens/sec "
+          f"({len(paths)} transcripts, {token_count} input tokens in {elapsed:.1f}s)")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,83 @@
+import os
+import sys
+import types
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import meeting_pipeline as mp
+
+
+class FakeSegment:
+    def __init__(self, start, end):
+        self.start, self.end = start, end
+
+
+class FakeDiarization:
+    def __init__(self, turns):
+        self.turns = turns
+
+    def labels(self):
+        return sorted({label for _, _, label in self.turns})
+
+    def itertracks(self, yield_label):
+        return [(FakeSegment(start, end), None, label) for start, end, label in self.turns]
+
+
+def make_stage(monkeypatch, per_chunk):
+    """A DiarizeStage whose pyannote pipeline returns per_chunk[i] for chunk i."""
+    monkeypatch.setitem(sys.modules, "torch", types.SimpleNamespace(
+        from_numpy=lambda audio: types.SimpleNamespace(unsqueeze=lambda dim: None)))
+    stage = mp.DiarizeStage.__new__(mp.DiarizeStage)
+    stage.linker = types.SimpleNamespace(assign=lambda labels, embeddings: {l: l for l in labels})
+    stage.resume_at = 0.0
+    stage.last_speaker = None
+    calls = iter(per_chunk)
+    stage.pipeline = lambda inputs, return_embeddings: (FakeDiarization(next(calls)), None)
+    return stage
+
+
+def run_chunks(stage, chunks):
+    turns = []
+    for chunk in chunks:
+        stage(chunk)
+        turns += [(s, chunk.offset + a, chunk.offset + b) for s, a, b in chunk.turns]
+    return turns
+
+
+def silence(seconds):
+    return np.zeros(int(seconds * mp.SAMPLE_RATE), dtype=np.float32)
+
+
+def test_turn_straddling_fallback_cut_is_kept(monkeypatch):
+    # Speech runs through the whole overlap window [120, 130), so the chunk is cut
+    # at its nominal span; B (112-128) has its midpoint past the cut.
+    stage = make_stage(monkeypatch, [
+        [(0, 112, "A"), (112, 128, "B"), (128, 130, "A")],
+        [(0, 8, "B"), (8, 80, "A")],
+    ])
+    chunks = [mp.Chunk(0, 0, silence(130), 120, False), mp.Chunk(1, 120, silence(80), 120, True)]
+    assert run_chunks(stage, chunks) == [
+        ("A", 0, 112), ("B", 112, 120), ("B", 120, 128), ("A", 128, 200)]
+
+
+def test_chunk_is_cut_at_pause_in_overlap(monkeypatch):
+    stage = make_stage(monkeypatch, [
+        [(0, 9, "A"), (9.5, 11.5, "B"), (12, 13, "C")],
+        [(0, 1.5, "B"), (2, 5, "C")],
+    ])
+    chunks = [mp.Chunk(0, 0, silence(13), 10, False), mp.Chunk(1, 10, silence(5), 10, True)]
+    assert run_chunks(stage, chunks) == [("A", 0, 9), ("B", 9.5, 11.5), ("C", 12, 15)]
+
+
+def test_clip_turns_drops_slivers():
+    turns = [("A", 0, 10.1), ("B", 10.05, 20)]
+    assert mp.clip_turns(turns, 10, 20) == [("B", 10.05, 20)]
+
+
+def test_linker_ignores_zero_and_nan_embeddings():
+    linker = mp.SpeakerLinker()
+    first = linker.assign(["A"], [np.array([1.0, 0.0])])
+    mapping = linker.assign(["A", "B", "C"], [np.array([1.0, 0.1]), np.zeros(2), np.full(2, np.nan)])
+    assert mapping == {"A": first["A"], "B": None, "C": None}
+    assert linker.labels == [first["A"]]
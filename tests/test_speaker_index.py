@@ -0,0 +1,15 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from speaker_index import SpeakerIndex
+
+
+def test_identify_without_speech(tmp_path):
+    index = SpeakerIndex(str(tmp_path))
+    index.add("alice", np.ones(8, dtype=np.float32))
+    # Cached diarizations of silent audio carry an empty (0, 0) embedding matrix.
+    assert index.identify([], np.zeros((0, 0))) == {}
+    assert index.search(np.ones(8))[0][0] == "alice"
@@ -0,0 +1,11 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from text_normalizer import normalize_batch, normalize_text
+
+
+def test_single_and_batch_agree_on_multiline_text():
+    texts = ["a (b\nc) d", "Twenty-five percent,\nisn't it?", "first line\nsecond line"]
+    assert [normalize_text(t) for t in texts] == normalize_batch(texts)
+    assert normalize_text("a (b\nc) d") == "a d"
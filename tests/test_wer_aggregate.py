@@ -0,0 +1,26 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from wer_aggregate import HIST_BIN, WerAccumulator
+
+
+def percentiles(values, qs):
+    acc = WerAccumulator()
+    acc.update(pd.Series(values))
+    return [acc.percentile(q) for q in qs]
+
+
+def test_percentiles_exact_for_repeated_values():
+    assert percentiles([0.10, 0.20], [50]) == pytest.approx([0.15])
+    assert percentiles([0.29], [50]) == pytest.approx([0.29])
+
+
+def test_percentiles_within_bin_resolution():
+    values = np.random.default_rng(0).random(5000) * 0.6
+    qs = [1, 50, 90, 99]
+    assert np.allclose(percentiles(values, qs), np.percentile(values, qs), atol=HIST_BIN)
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Shared English text normalization for WER scoring (Whisper-style rules).
+
+Lowercases, drops bracketed annotations and filler words, expands contractions,
+strips punctuation and converts spelled-out numbers to digits, so that e.g.
+"Twenty-five percent, isn't it?" and "25% is not it" normalize identically.
+
+All evaluators import `normalize_text` / `normalize_batch` from here so every
+engine is scored against the same references.
+"""
+
+import re
+import string
+from functools import lru_cache
+
+# Bump whenever the rules change; dataset CSVs store it next to `normalized_gt`.
+NORMALIZER_VERSION = "1"
+
+# ---------- Precompiled tables and patterns ----------
+_QUOTES = str.maketrans({"’": "'", "‘": "'", "`": "'"})
+# Every punctuation mark except "'" and "." becomes a space; those two are handled by rules.
+_PUNCT = str.maketrans({c: " " for c in string.punctuation if c not in "'."})
+
+# Every pattern starts with a literal character so the regex engine can jump straight
+# to candidate positions instead of trying each offset; that keeps a pass over a whole
+# joined column close to memchr speed.
+_BRACKETS_RE = re.compile(r"[\[(<][^\])>\n]*[\])>]")
+_THOUSANDS_RE = re.compile(r",(?<=\d,)(?=\d{3}\b)")
+_STRAY_DOT_RE = re.compile(r"\.(?:(?<!\d\.)|(?!\d))")
+_CONTRACTION_RULES = [
+    (re.compile(r"won't\b(?<=\bwon't)"), "will not"),
+    (re.compile(r"can't\b(?<=\bcan't)"), "can not"),
+    (re.compile(r"shan't\b(?<=\bshan't)"), "shall not"),
+    (re.compile(r"let's\b(?<=\blet's)"), "let us"),
+    (re.compile(r"n't\b"), " not"),
+    (re.compile(r"'re\b"), " are"),
+    (re.compile(r"'ll\b"), " will"),
+    (re.compile(r"'ve\b"), " have"),
+    (re.compile(r"'m\b"), " am"),
+    (re.compile(r"'d been\b"), " had been"),
+    (re.compile(r"'d\b"), " would"),
+]
+
+FILLERS = frozenset({"um", "umm", "uh", "uhh", "hmm", "mm", "mhm", "er", "ah"})
+
+_ONES = {w: i for i, w in enumerate(
+    "zero one two three four five six seven eight nine ten eleven twelve thirteen "
+    "fourteen fifteen sixteen seventeen eighteen nineteen".split())}
+_TENS = {w: 10 * i for i, w in enumerate(
+    "twenty thirty forty fifty sixty seventy eighty ninety".split(), start=2)}
+_BIG = {"thousand": 1000, "million": 1000000, "billion": 1000000000}
+_NUMBER_WORDS = frozenset(_ONES) | frozenset(_TENS) | frozenset(_BIG) | {"hundred"}
+
+# ---------- Rules ----------
+def _parse_number(tokens, i):
+    """
+    Parse the longest spelled-out number starting at tokens[i].
+    Returns (value, next_index, is_two_digit) where is_two_digit marks plain 10-99
+    values (used to join years such as "nineteen ninety" -> 1990).
+    """
+    total = current = 0
+    last = None
+    j = i
+    n = len(tokens)
+    while j < n:
+        t = tokens[j]
+        if t in _ONES:
+            v = _ONES[t]
+            if last in ("ones", "teen") or (last == "tens" and (v >= 10 or v == 0)):
+                break
+            current += v
+            last = "teen" if v >= 10 else "ones"
+        elif t in _TENS:
+            if last in ("ones", "teen", "tens"):
+                break
+            current += _TENS[t]
+            last = "tens"
+        elif t == "hundred":
+            if last not in (None, "ones", "teen", "tens"):
+                break
+            current = (current or 1) * 100
+            last = "hundred"
+        elif t in _BIG:
+            if last == "big":
+                break
+            total += (current or 1) * _BIG[t]
+            current = 0
+            last = "big"
+        elif t == "and" and last in ("hundred", "big") and j + 1 < n and (
+                tokens[j + 1] in _ONES or tokens[j + 1] in _TENS):
+            pass
+        else:
+            break
+        j += 1
+    value = total + current
+    return value, j, total == 0 and last in ("teen", "tens", "ones") and 10 <= value <= 99
+
+def _numbers_to_digits(tokens):
+    out = []
+    i = 0
+    prev_two_digit = False
+    while i < len(tokens):
+        if tokens[i] not in _NUMBER_WORDS:
+            out.append(tokens[i])
+            prev_two_digit = False
+            i += 1
+            continue
+        value, i, two_digit = _parse_number(tokens, i)
+        if prev_two_digit and two_digit:
+            out[-1] += str(value)
+            prev_two_digit = False
+        else:
+            out.append(str(value))
+            prev_two_digit = two_digit
+    return out
+
+def _normalize_tokens(tokens):
+    if not FILLERS.isdisjoint(tokens):
+        tokens = [t for t in tokens if t not in FILLERS]
+    if not _NUMBER_WORDS.isdisjoint(tokens):
+        tokens = _numbers_to_digits(tokens)
+    return " ".join(tokens)
+
+def _normalize_string(text):
+    """Character-level rules; safe to run on many lines joined with newlines."""
+    text = text.lower().translate(_QUOTES)
+    if "[" in text or "(" in text or "<" in text:
+        text = _BRACKETS_RE.sub(" ", text)
+    text = text.replace("%", " percent")
+    if "," in text:
+        text = _THOUSANDS_RE.sub("", text)
+    if "'" in text:
+        for pattern, repl in _CONTRACTION_RULES:
+            text = pattern.sub(repl, text)
+        text = text.replace("'", "")
+    if "." in text:
+        text = _STRAY_DOT_RE.sub(" ", text)
+    return text.translate(_PUNCT)
+
+# ---------- Public API ----------
+@lru_cache(maxsize=1 << 16)
+def normalize_text(text: str) -> str:
+    """Normalize a single transcript for WER scoring."""
+    # Same line handling as normalize_batch, so multi-line references match either way.
+    return _normalize_tokens(_normalize_string(text.replace("\n", " ")).split())
+
+def normalize_batch(texts):
+    """
+    Normalize a whole column (list, Series, ...) at once. The character-level pass
+    runs over one joined string; lines are then split back out for the token rules.
+    """
+    texts = ["" if t is None or t != t else str(t).replace("\n", " ") for t in texts]
+    lines = _normalize_string("\n".join(texts)).split("\n")
+    return [_normalize_tokens(line.split()) for line in lines]
+
+def normalized_references(df, text_column="ground_truth", cache_column="normalized_gt"):
+    """
+    Normalized references for a dataset DataFrame, reusing the memoized column
+    when it was written by the current normalizer version.
+    """
+    if cache_column in df and "normalizer" in df and (df["normalizer"].astype(str) == NORMALIZER_VERSION).all():
+        return df[cache_column].fillna("").astype(str).tolist()
+    return normalize_batch(df[text_column])
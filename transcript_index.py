@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Inverted index over meeting transcripts for fast keyword, phrase and speaker search.
+
+Postings (term, meeting, position, speaker, start, end) are kept in an SQLite file.
+Re-indexing only touches transcripts whose size or mtime changed since the last run.
+
+Supported transcripts:
+  - *.jsonl   one Vosk-style result per line with per-word timings ("result"/"words")
+  - *.txt     plain lines or diarized "[SPEAKER_00]: text" lines; if a sibling
+              <stem>.rttm exists, each line gets its speaker turn's start/end
+When a meeting has several forms (.speakers.jsonl, .jsonl, .diarized.txt, .txt),
+only the most detailed one is indexed.
+
+Usage:
+  python transcript_index.py build --index transcripts.db transcripts/
+  python transcript_index.py search --index transcripts.db "budget review" --speaker SPEAKER_01
+"""
+
+import os
+import re
+import json
+import sqlite3
+import argparse
+from collections import Counter
+
+TOKEN_RE = re.compile(r"[a-z0-9]+(?:'[a-z0-9]+)*")
+SPEAKER_LINE_RE = re.compile(r"^\[([^\]]+)\]:\s*(.*)$")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meetings (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS postings (
+    meeting_id INTEGER NOT NULL,
+    pos INTEGER NOT NULL,
+    term TEXT NOT NULL,
+    speaker TEXT,
+    start_time REAL,
+    end_time REAL,
+    PRIMARY KEY (meeting_id, pos)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_term ON postings (term, meeting_id, pos);
+CREATE TABLE IF NOT EXISTS terms (
+    term TEXT PRIMARY KEY,
+    freq INTEGER NOT NULL
+) WITHOUT ROWID;
+"""
+
+def tokenize(text):
+    return TOKEN_RE.findall(text.lower())
+
+# ---------- Transcript parsing ----------
+def _read_rttm_turns(rttm_path):
+    turns = []
+    with open(rttm_path, "r", encoding="utf-8") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 8 and parts[0] == "SPEAKER":
+                start, duration = float(parts[3]), float(parts[4])
+                turns.append((parts[7], start, start + duration))
+    return turns
+
+def parse_jsonl(path):
+    """Yield (term, speaker, start, end) from a word-timed JSONL transcript."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            res = json.loads(line)
+            words = res.get("result") or res.get("words") or []
+            default_speaker = res.get("speaker")
+            if not words:
+                for term in tokenize(res.get("text", "")):
+                    yield term, default_speaker, res.get("start"), res.get("end")
+                continue
+            for w in words:
+                for term in tokenize(w.get("word", "")):
+                    yield term, w.get("speaker", default_speaker), w.get("start"), w.get("end")
+
+def parse_text(path):
+    """Yield (term, speaker, start, end) from a plain or diarized text transcript."""
+    with open(path, "r", encoding="utf-8") as f:
+        lines = [line.rstrip("\n") for line in f if line.strip()]
+
+    turns = []
+    rttm_path = os.path.splitext(path)[0]
+    if rttm_path.endswith(".diarized"):
+        rttm_path = rttm_path[:-len(".diarized")]
+    rttm_path += ".rttm"
+    if os.path.isfile(rttm_path):
+        turns = _read_rttm_turns(rttm_path)
+    # Diarized transcripts are written in RTTM track order, one line per turn.
+    use_turns = len(turns) == len(lines)
+
+    for i, line in enumerate(lines):
+        speaker, text = None, line
+        m = SPEAKER_LINE_RE.match(line)
+        if m:
+            speaker, text = m.group(1), m.group(2)
+        start = end = None
+        if use_turns:
+            _, start, end = turns[i]
+        for term in tokenize(text):
+            yield term, speaker, start, end
+
+def parse_transcript(path):
+    if path.endswith(".jsonl"):
+        return parse_jsonl(path)
+    return parse_text(path)
+
+# Most detailed form first: the same meeting may exist as several of these.
+TRANSCRIPT_SUFFIXES = (".speakers.jsonl", ".jsonl", ".diarized.txt", ".txt")
+
+def select_transcripts(files):
+    """Pick one transcript file per meeting stem, preferring word-timed/speaker-labelled forms."""
+    best = {}
+    for file in files:
+        if file.endswith(".summary.txt"):
+            continue
+        for rank, suffix in enumerate(TRANSCRIPT_SUFFIXES):
+            if file.endswith(suffix):
+                stem = file[:-len(suffix)]
+                if stem not in best or rank < best[stem][0]:
+                    best[stem] = (rank, file)
+                break
+    return [file for _, file in best.values()]
+
+# ---------- Index ----------
+class TranscriptIndex:
+    def __init__(self, index_path):
+        self.conn = sqlite3.connect(index_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        # Indexes built before the terms table existed: derive it once from postings.
+        if (self.conn.execute("SELECT 1 FROM postings LIMIT 1").fetchone()
+                and not self.conn.execute("SELECT 1 FROM terms LIMIT 1").fetchone()):
+            with self.conn:
+                self.conn.execute("INSERT INTO terms (term, freq) SELECT term, COUNT(*) FROM postings GROUP BY term")
+
+    def close(self):
+        self.conn.close()
+
+    def update(self, roots):
+        """Index new/changed transcripts under `roots` and drop ones that disappeared."""
+        known = {path: (mid, mtime, size) for mid, path, mtime, size
+                 in self.conn.execute("SELECT id, path, mtime, size FROM meetings")}
+        seen = set()
+        added = updated = 0
+
+        for root in roots:
+            root = os.path.abspath(root)
+            for dirpath, _, files in os.walk(root):
+                for file in select_transcripts(files):
+                    path = os.path.join(dirpath, file)
+                    st = os.stat(path)
+                    seen.add(path)
+                    prev = known.get(path)
+                    if prev and prev[1] == st.st_mtime and prev[2] == st.st_size:
+                        continue
+                    try:
+                        self._index_file(path, st, prev[0] if prev else None)
+                    except (OSError, ValueError) as e:
+                        print(f"  ⚠️ Skipping {path}: {e}")
+                        continue
+                    if prev:
+                        updated += 1
+                    else:
+                        added += 1
+
+        roots = [os.path.abspath(r) + os.sep for r in roots]
+        removed = [(mid,) for path, (mid, _, _) in known.items()
+                   if path not in seen and any(path.startswith(r) for r in roots)]
+        with self.conn:
+            for (mid,) in removed:
+                self._drop_postings(mid)
+            self.conn.executemany("DELETE FROM meetings WHERE id = ?", removed)
+        return added, updated, len(removed)
+
+    def _drop_postings(self, meeting_id):
+        """Delete a meeting's postings and decrement its term frequencies."""
+        counts = self.conn.execute("SELECT COUNT(*), term FROM postings WHERE meeting_id = ? GROUP BY term",
+                                   (meeting_id,)).fetchall()
+        self.conn.executemany("UPDATE terms SET freq = freq - ? WHERE term = ?", counts)
+        self.conn.execute("DELETE FROM postings WHERE meeting_id = ?", (meeting_id,))
+
+    def _index_file(self, path, st, meeting_id):
+        postings = list(parse_transcript(path))
+        with self.conn:
+            if meeting_id is None:
+                cur = self.conn.execute("INSERT INTO meetings (path, mtime, size) VALUES (?, ?, ?)",
+                                        (path, st.st_mtime, st.st_size))
+                meeting_id = cur.lastrowid
+            else:
+                self._drop_postings(meeting_id)
+                self.conn.execute("UPDATE meetings SET mtime = ?, size = ? WHERE id = ?",
+                                  (st.st_mtime, st.st_size, meeting_id))
+            self.conn.executemany(
+                "INSERT INTO postings (meeting_id, pos, term, speaker, start_time, end_time) VALUES (?, ?, ?, ?, ?, ?)",
+                ((meeting_id, pos, term, speaker, start, end)
+                 for pos, (term, speaker, start, end) in enumerate(postings)))
+            self.conn.executemany(
+                "INSERT INTO terms (term, freq) VALUES (?, ?) "
+                "ON CONFLICT(term) DO UPDATE SET freq = freq + excluded.freq",
+                Counter(term for term, _, _, _ in postings).items())
+
+    def search(self, query, speaker=None, limit=20):
+        """
+        Term or phrase search. Returns dicts with path, speaker, start, end, pos.
+        Multi-word queries match consecutive words; `speaker` filters on the first word.
+        Phrases are driven from their rarest term, so common words like "the" are
+        only probed by position instead of scanned.
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+        freqs = dict(self.conn.execute(
+            f"SELECT term, freq FROM terms WHERE term IN ({','.join('?' * len(terms))})", terms))
+        if any(freqs.get(t, 0) <= 0 for t in terms):
+            return []
+        a = min(range(len(terms)), key=lambda k: freqs[terms[k]])
+
+        # CROSS JOIN pins the join order in SQLite: the anchor's postings are the outer loop.
+        joins, where, params = [], [f"p{a}.term = ?"], [terms[a]]
+        for k, term in enumerate(terms):
+            if k == a:
+                continue
+            joins.append(f"CROSS JOIN postings p{k}")
+            where.append(f"p{k}.meeting_id = p{a}.meeting_id AND p{k}.pos = p{a}.pos + {k - a} AND p{k}.term = ?")
+            params.append(term)
+        if speaker:
+            where.append("p0.speaker = ?")
+            params.append(speaker)
+        last = f"p{len(terms) - 1}"
+        sql = (f"SELECT m.path, p0.meeting_id, p0.pos, p0.speaker, p0.start_time, {last}.end_time "
+               f"FROM postings p{a} {' '.join(joins)} CROSS JOIN meetings m "
+               f"WHERE m.id = p{a}.meeting_id AND {' AND '.join(where)} "
+               f"ORDER BY p{a}.meeting_id, p{a}.pos LIMIT ?")
+        params.append(limit)
+
+        return [{"path": path, "meeting_id": mid, "pos": pos, "speaker": spk, "start": start, "end": end}
+                for path, mid, pos, spk, start, end in self.conn.execute(sql, params)]
+
+    def context(self, meeting_id, pos, width=6):
+        rows = self.conn.execute(
+            "SELECT term FROM postings WHERE meeting_id = ? AND pos BETWEEN ? AND ? ORDER BY pos",
+            (meeting_id, max(0, pos - width), pos + width))
+        return " ".join(term for (term,) in rows)
+
+# ---------- Main ----------
+def _fmt_time(seconds):
+    if seconds is None:
+        return "--:--"
+    minutes, secs = divmod(int(seconds), 60)
+    return f"{minutes:02d}:{secs:02d}"
+
+def main():
+    parser = argparse.ArgumentParser(description="Index and search meeting transcripts")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build", help="Index new or changed transcripts")
+    build.add_argument("roots", nargs="*", default=["transcripts"], help="Transcript directories")
+
+    search = sub.add_parser("search", help="Search for a word or phrase")
+    search.add_argument("query", help="Word or phrase to search for")
+    search.add_argument("--speaker", default=None, help="Only match words spoken by this speaker label")
+    search.add_argument("--limit", type=int, default=20, help="Maximum number of hits")
+
+    for p in (build, search):
+        p.add_argument("--index", default="transcripts.db", help="Index database file")
+    args = parser.parse_args()
+
+    index = TranscriptIndex(args.index)
+    try:
+        if args.command == "build":
+            missing = [r for r in args.roots if not os.path.isdir(r)]
+            if missing:
+                print(f"❌ Directory not found: {', '.join(missing)}")
+                return
+            added, updated, removed = index.update(args.roots)
+            print(f"✅ Index updated: {added} added, {updated} re-indexed, {removed} removed")
+        else:
+            hits = index.search(args.query, speaker=args.speaker, limit=args.limit)
+            if not hits:
+                print(f"⚠️ No matches for '{args.query}'")
+            for hit in hits:
+                meeting = os.path.basename(hit["path"])
+                speaker = hit["speaker"] or "-"
+                print(f"{meeting} [{_fmt_time(hit['start'])}] {speaker}: "
+                      f"... {index.context(hit['meeting_id'], hit['pos'])} ...")
+    finally:
+        index.close()
+
+if __name__ == "__main__":
+    main()